@@ -3,9 +3,25 @@ from PySide6 import QtWidgets
 from screenshot_tool import ScreenshotTool
 from image_analysis_window import ImageAnalysisWindow
 import os
-import json
+
+# orjson is optional; it writes compact bytes directly, which is what we compare and store
+try:
+    import orjson
+
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    import json
+
+    def _dumps(obj):
+        return json.dumps(obj, separators=(',', ':')).encode()
+
+    _loads = json.loads
 
 class AISnippingTool:
+    config_path = os.path.join(os.path.expanduser('~'), '.ai-snipping-tool', 'config.json')
+    _config_dir_ready = False
+
     def __init__(self):
         self.app = QtWidgets.QApplication(sys.argv)
         self.load_config()
@@ -13,12 +29,15 @@ class AISnippingTool:
         self.image_analysis_window = None
         
     def load_config(self):
-        config_path = os.path.join(os.path.expanduser('~'), '.ai-snipping-tool', 'config.json')
-        os.makedirs(os.path.dirname(config_path), exist_ok=True)
+        if not AISnippingTool._config_dir_ready:
+            os.makedirs(os.path.dirname(self.config_path), exist_ok=True)
+            AISnippingTool._config_dir_ready = True
+        self._config_bytes = None
         
-        if os.path.exists(config_path):
-            with open(config_path, 'r') as f:
-                self.config = json.load(f)
+        if os.path.exists(self.config_path):
+            with open(self.config_path, 'rb') as f:
+                self.config = _loads(f.read())
+            self._config_bytes = _dumps(self.config)
         else:
             self.config = {
                 'theme': 'dark',
@@ -28,9 +47,13 @@ class AISnippingTool:
             self.save_config()
             
     def save_config(self):
-        config_path = os.path.join(os.path.expanduser('~'), '.ai-snipping-tool', 'config.json')
-        with open(config_path, 'w') as f:
-            json.dump(self.config, f)
+        # Skip the write entirely when nothing changed since the last load/save
+        new_bytes = _dumps(self.config)
+        if new_bytes == self._config_bytes:
+            return
+        with open(self.config_path, 'wb') as f:
+            f.write(new_bytes)
+        self._config_bytes = new_bytes
 
     def start(self):
         self.screenshot_tool = ScreenshotTool()
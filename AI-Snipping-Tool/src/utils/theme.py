@@ -1,24 +1,35 @@
 import darkdetect
 from PySide6 import QtWidgets, QtGui, QtCore
 
+# darkdetect can shell out / hit DBus, so only ask once until invalidated
+_color_mode = None
+
+_DARK_QSS = """
+    QWidget {
+        background-color: #2d2d2d;
+        color: #ffffff;
+    }
+"""
+
+_LIGHT_QSS = """
+    QWidget {
+        background-color: #ffffff;
+        color: #000000;
+    }
+"""
+
 def get_color_mode():
-    return 'dark' if darkdetect.isDark() else 'light'
+    global _color_mode
+    if _color_mode is None:
+        _color_mode = 'dark' if darkdetect.isDark() else 'light'
+    return _color_mode
+
+def invalidate():
+    """Forget the cached color mode, e.g. after the system theme changed"""
+    global _color_mode
+    _color_mode = None
 
 class ThemeManager:
     @staticmethod
     def apply_theme(widget):
-        color_mode = get_color_mode()
-        if color_mode == 'dark':
-            widget.setStyleSheet("""
-                QWidget {
-                    background-color: #2d2d2d;
-                    color: #ffffff;
-                }
-            """)
-        else:
-            widget.setStyleSheet("""
-                QWidget {
-                    background-color: #ffffff;
-                    color: #000000;
-                }
-            """)
+        widget.setStyleSheet(_DARK_QSS if get_color_mode() == 'dark' else _LIGHT_QSS)
@@ -1,10 +1,11 @@
+import logging
 import os
 import sys
+import threading
 from datetime import datetime
 from PySide6 import QtWidgets, QtCore, QtGui
 from PySide6.QtCore import Qt
 import mss
-import mss.tools
 
 class ScreenshotTool(QtWidgets.QWidget):
     screenshot_taken = QtCore.Signal(str)
@@ -14,20 +15,34 @@ class ScreenshotTool(QtWidgets.QWidget):
         self.begin = QtCore.QPoint()
         self.end = QtCore.QPoint()
         self.is_selecting = False
+        self._update_pending = False
+        self._painted_rect = QtCore.QRect()
+        # Normalized selection, recomputed once per mouse event and shared by paint and capture
+        self._sel_rect = QtCore.QRect()
+        self._last_size_text = ''
         
-        # Take initial screenshot of the entire screen
+        # Take initial screenshot of the entire (primary) screen
         with mss.mss() as sct:
-            # Get the primary monitor
             self.monitor = sct.monitors[1]  # Primary monitor
             self.screen_shot = sct.grab(self.monitor)
-            
-            # Convert to QPixmap for display
-            img = QtGui.QImage(bytes(self.screen_shot.rgb), 
-                              self.screen_shot.width, 
-                              self.screen_shot.height,
-                              self.screen_shot.width * 3,
-                              QtGui.QImage.Format_RGB888)
-            self.background = QtGui.QPixmap.fromImage(img)
+
+        # Wrap mss's native BGRA buffer directly (no RGB repack or extra copy).
+        # Keep a reference so the buffer outlives the QImage pointing at it.
+        self._raw = self.screen_shot.raw
+        # Format_RGB32 is BGRA in memory on little-endian, i.e. exactly what mss hands back.
+        self.image = QtGui.QImage(self._raw,
+                                  self.screen_shot.width,
+                                  self.screen_shot.height,
+                                  self.screen_shot.width * 4,
+                                  QtGui.QImage.Format_RGB32)
+        self.background = QtGui.QPixmap.fromImage(self.image)
+
+        # Pre-render the darkened overlay once so paintEvent only has to blit
+        self.darkened = QtGui.QPixmap(self.background.size())
+        overlay_painter = QtGui.QPainter(self.darkened)
+        overlay_painter.drawPixmap(0, 0, self.background)
+        overlay_painter.fillRect(self.darkened.rect(), QtGui.QColor(0, 0, 0, 100))
+        overlay_painter.end()
         
         # Set up the window to cover the entire screen
         self.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint)
@@ -52,31 +67,25 @@ class ScreenshotTool(QtWidgets.QWidget):
 
     def paintEvent(self, event):
         painter = QtGui.QPainter(self)
-        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        # Only touch the damaged region reported by update(QRect)
+        painter.setClipRect(event.rect())
         
-        # Draw the screenshot as background
-        painter.drawPixmap(self.rect(), self.background)
-        
-        # Draw semi-transparent overlay
-        overlay = QtGui.QColor(0, 0, 0, 100)
-        painter.fillRect(self.rect(), overlay)
+        # Draw the pre-darkened screenshot as background
+        painter.drawPixmap(self.rect(), self.darkened)
 
         if self.is_selecting and not self.begin.isNull() and not self.end.isNull():
-            rect = QtCore.QRect(self.begin, self.end).normalized()
+            rect = self._sel_rect
             
-            # Clear the selection area
-            painter.setCompositionMode(QtGui.QPainter.CompositionMode_Clear)
-            painter.eraseRect(rect)
+            # Punch through to the original screenshot inside the selection
+            painter.drawPixmap(rect, self.background, rect)
             
-            # Draw border around selection
-            painter.setCompositionMode(QtGui.QPainter.CompositionMode_SourceOver)
+            # Draw border around selection. Every edge is pixel-aligned, so no antialiasing.
             
-            # Draw the outer glow effect
-            glow_color = QtGui.QColor(0, 255, 0, 40)
-            for i in range(3):
-                pen = QtGui.QPen(glow_color, i + 1)
-                painter.setPen(pen)
-                painter.drawRect(rect.adjusted(-i, -i, i, i))
+            # Draw the outer glow effect as one wide stroke instead of three nested rects
+            glow_pen = QtGui.QPen(QtGui.QColor(0, 255, 0, 40))
+            glow_pen.setWidth(3)
+            painter.setPen(glow_pen)
+            painter.drawRect(rect.adjusted(-1, -1, 1, 1))
             
             # Draw the main border
             pen = QtGui.QPen(QtGui.QColor(0, 255, 0), 1.5)
@@ -101,18 +110,6 @@ class ScreenshotTool(QtWidgets.QWidget):
                     handle_size * 2, 
                     handle_size * 2
                 ))
-            
-            # Update size label
-            size_text = f"{rect.width()} × {rect.height()}px"
-            self.size_label.setText(size_text)
-            
-            # Position the label
-            label_x = rect.center().x() - self.size_label.width() // 2
-            label_y = rect.top() - 30
-            if label_y < 0:
-                label_y = rect.bottom() + 10
-            self.size_label.move(label_x, label_y)
-            self.size_label.show()
 
     def keyPressEvent(self, event):
         if event.key() == Qt.Key_Escape:
@@ -124,27 +121,53 @@ class ScreenshotTool(QtWidgets.QWidget):
 
     def mousePressEvent(self, event):
         self.begin = event.pos()
-        self.end = self.begin
+        self._update_selection(self.begin)
         self.is_selecting = True
+        self._painted_rect = QtCore.QRect()
         self.update()
 
     def mouseMoveEvent(self, event):
         if self.is_selecting:
-            self.end = event.pos()
-            self.update()
+            self._update_selection(event.pos())
+            # Collapse bursts of mouse moves into a single repaint
+            if not self._update_pending:
+                self._update_pending = True
+                QtCore.QTimer.singleShot(0, self._flush_update)
             
-            # Update size label position
-            rect = QtCore.QRect(self.begin, self.end).normalized()
-            size_text = f"{rect.width()} × {rect.height()}px"
+            self._update_size_label()
+
+    def _update_selection(self, end):
+        """Move the selection end and recompute the normalized selection rect"""
+        self.end = end
+        self._sel_rect = QtCore.QRect(self.begin, self.end).normalized()
+
+    def _update_size_label(self):
+        """Show the selection size above (or below) the selection, touching the label only when needed"""
+        rect = self._sel_rect
+        size_text = f"{rect.width()} × {rect.height()}px"
+        # setText relayouts and repaints the label even for identical text
+        if size_text != self._last_size_text:
+            self._last_size_text = size_text
             self.size_label.setText(size_text)
-            
-            label_x = rect.center().x() - self.size_label.width() // 2
-            label_y = rect.top() - 30
-            if label_y < 0:
-                label_y = rect.bottom() + 10
-            self.size_label.move(label_x, label_y)
+            self.size_label.adjustSize()
+
+        label_x = rect.center().x() - self.size_label.width() // 2
+        label_y = rect.top() - 30
+        if label_y < 0:
+            label_y = rect.bottom() + 10
+        self.size_label.move(label_x, label_y)
+        if not self.size_label.isVisible():
             self.size_label.show()
 
+    def _flush_update(self):
+        """Repaint once for all mouse moves queued since the last flush"""
+        self._update_pending = False
+        rect = self._sel_rect
+        # Repaint only the band covering the old and new selection, plus room for glow and handles
+        dirty = rect.united(self._painted_rect).adjusted(-6, -6, 6, 6)
+        self._painted_rect = rect
+        self.update(dirty)
+
     def mouseReleaseEvent(self, event):
         if self.is_selecting:
             # Ensure we have a valid selection
@@ -154,7 +177,8 @@ class ScreenshotTool(QtWidgets.QWidget):
 
     def capture_screenshot(self):
         if self.begin and self.end:
-            rect = QtCore.QRect(self.begin, self.end).normalized()
+            # Keep the selection inside the captured screen
+            rect = self._sel_rect.intersected(QtCore.QRect(0, 0, self.screen_shot.width, self.screen_shot.height))
             x1, y1 = rect.left(), rect.top()
             x2, y2 = rect.right(), rect.bottom()
             width = x2 - x1
@@ -163,42 +187,28 @@ class ScreenshotTool(QtWidgets.QWidget):
             if width <= 0 or height <= 0:
                 return
 
-            # Take a new clean screenshot without any overlay or selection border
-            with mss.mss() as sct:
-                # Adjust coordinates relative to the primary monitor
-                x1 += self.monitor["left"]
-                y1 += self.monitor["top"]
-                
-                region = {
-                    'top': y1,
-                    'left': x1,
-                    'width': width,
-                    'height': height,
-                    'mon': 1  # Ensure we're using the primary monitor
-                }
-                
-                # Capture without any UI elements
-                self.hide()  # Hide the selection UI
-                QtCore.QTimer.singleShot(50, lambda: self._finish_capture(region))  # Wait for UI to hide
-
-    def _finish_capture(self, region):
-        """Helper method to finish the capture after UI is hidden"""
-        try:
-            with mss.mss() as sct:
-                screenshot = sct.grab(region)
-                
-                # Generate filename with timestamp
-                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                filename = f'screenshot_{timestamp}.png'
-                
-                # Save to Documents/WritingTools/screenshots
-                docs_path = os.path.join(os.path.expanduser('~'), 'Documents')
-                save_path = os.path.join(docs_path, 'WritingTools', 'screenshots')
-                os.makedirs(save_path, exist_ok=True)
-                
-                full_path = os.path.join(save_path, filename)
-                mss.tools.to_png(screenshot.rgb, screenshot.size, output=full_path)
-                
-                self.screenshot_taken.emit(full_path)
-        finally:
-            self.close()
+            # Generate filename with timestamp
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            filename = f'screenshot_{timestamp}.png'
+
+            # Save to Documents/WritingTools/screenshots
+            docs_path = os.path.join(os.path.expanduser('~'), 'Documents')
+            save_path = os.path.join(docs_path, 'WritingTools', 'screenshots')
+            os.makedirs(save_path, exist_ok=True)
+
+            full_path = os.path.join(save_path, filename)
+
+            # The screenshot taken in __init__ predates the overlay, so crop it instead of
+            # hiding the UI and grabbing the screen a second time.
+            # Encode off the GUI thread; the signal is emitted once the file exists
+            region = QtCore.QRect(x1, y1, width, height)
+            threading.Thread(target=self._save_png, args=(region, full_path), daemon=True).start()
+
+    def _save_png(self, region, full_path):
+        """Thread function to encode the capture to PNG and announce it"""
+        # Let Qt crop and encode the BGRA image directly, skipping mss's Python-side RGB repack.
+        # Quality 80 maps to zlib level 1: favour encode speed over file size.
+        if not self.image.copy(region).save(full_path, 'PNG', 80):
+            logging.error(f'Error saving screenshot to {full_path}')
+            return
+        self.screenshot_taken.emit(full_path)
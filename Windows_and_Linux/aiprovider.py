@@ -1,16 +1,28 @@
 import logging
+import time
 import webbrowser
 from abc import ABC, abstractmethod
 from typing import List
 
-import google.generativeai as genai
-from google.generativeai.types import HarmBlockThreshold, HarmCategory
-from openai import OpenAI
 from PySide6 import QtWidgets
 from PySide6.QtWidgets import QVBoxLayout
 
 from ui.UIUtils import colorMode
 
+# Streamed output is handed to the GUI once this many characters or seconds have accumulated
+STREAM_FLUSH_CHARS = 64
+STREAM_FLUSH_INTERVAL = 0.03
+
+# colorMode is fixed at import, so the setting stylesheets only need building once
+_LABEL_QSS = f"font-size: 16px; color: {'#ffffff' if colorMode == 'dark' else '#333333'};"
+_INPUT_QSS = f"""
+            font-size: 16px;
+            padding: 5px;
+            background-color: {'#444' if colorMode == 'dark' else 'white'};
+            color: {'#ffffff' if colorMode == 'dark' else '#000000'};
+            border: 1px solid {'#666' if colorMode == 'dark' else '#ccc'};
+        """
+
 
 class AIProviderSetting(ABC):
     def __init__(self, name: str, display_name: str = None, default_value: str = None, description: str = None):
@@ -41,17 +53,11 @@ class TextSetting(AIProviderSetting):
     def render_to_layout(self, layout: QVBoxLayout):
         row_layout = QtWidgets.QHBoxLayout()
         label = QtWidgets.QLabel(self.display_name)
-        label.setStyleSheet(f"font-size: 16px; color: {'#ffffff' if colorMode == 'dark' else '#333333'};")
+        label.setStyleSheet(_LABEL_QSS)
         row_layout.addWidget(label)
 
         self.input = QtWidgets.QLineEdit(self.internal_value)
-        self.input.setStyleSheet(f"""
-            font-size: 16px;
-            padding: 5px;
-            background-color: {'#444' if colorMode == 'dark' else 'white'};
-            color: {'#ffffff' if colorMode == 'dark' else '#000000'};
-            border: 1px solid {'#666' if colorMode == 'dark' else '#ccc'};
-        """)
+        self.input.setStyleSheet(_INPUT_QSS)
 
         self.input.setPlaceholderText(self.description)
 
@@ -131,6 +137,41 @@ class AIProvider(ABC):
         """
         pass
 
+    def emit_stream(self, texts, signal=None):
+        """
+        Forward streamed text pieces to a signal (the app's output_ready_signal by default),
+        coalesced so the GUI receives at most one update per flush interval.
+        Stops early if the request is cancelled.
+        """
+        if signal is None:
+            signal = self.app.output_ready_signal
+        buffer = []
+        buffered_length = 0
+        last_emit = time.monotonic()
+        try:
+            for text in texts:
+                if self.close_requested:
+                    return
+                buffer.append(text)
+                buffered_length += len(text)
+                if buffered_length > STREAM_FLUSH_CHARS or time.monotonic() - last_emit > STREAM_FLUSH_INTERVAL:
+                    pending = ''.join(buffer)
+                    text = pending.rstrip('\n')
+                    if text:
+                        signal.emit(text)
+                    # Hold back trailing newlines: they go out with the next text,
+                    # or are dropped if the output ends here
+                    held = pending[len(text):]
+                    buffer = [held] if held else []
+                    buffered_length = len(held)
+                    last_emit = time.monotonic()
+        finally:
+            # Deliver what already arrived even if the stream failed partway, so the text
+            # shows up before the caller reports the error. Trailing newlines are stripped once.
+            text = ''.join(buffer).rstrip('\n')
+            if text and not self.close_requested:
+                signal.emit(text)
+
     def analyze_image(self, messages):
         """
         Analyze an image using the OpenAI API
@@ -176,12 +217,7 @@ class Gemini15FlashProvider(AIProvider):
             return
 
         try:
-            for chunk in response:
-                if self.close_requested:
-                    break
-                else:
-                    # Strip any trailing newlines from chunks
-                    self.app.output_ready_signal.emit(chunk.text.rstrip('\n'))
+            self.emit_stream(chunk.text for chunk in response)
         except Exception as e:
             logging.error(f"Error while streaming: {e}")
             self.app.output_ready_signal.emit("An error occurred while streaming.")
@@ -191,6 +227,10 @@ class Gemini15FlashProvider(AIProvider):
 
 
     def after_load(self):
+        # Imported here so the gRPC/protobuf stack is only loaded when Gemini is actually used
+        import google.generativeai as genai
+        from google.generativeai.types import HarmBlockThreshold, HarmCategory
+
         genai.configure(api_key=self.api_key)
 
         self.model = genai.GenerativeModel(
@@ -214,10 +254,11 @@ class Gemini15FlashProvider(AIProvider):
     def cancel(self):
         self.close_requested = True
 
-    def analyze_image(self, screenshot_path, prompt):
+    def analyze_image(self, screenshot_path, prompt, response_window):
         """
         Analyze an image using Gemini's vision capabilities
         """
+        self.close_requested = False
         try:
             import PIL.Image
             
@@ -230,28 +271,20 @@ class Gemini15FlashProvider(AIProvider):
                     prompt,
                     image
                 ],
-                stream=False  # Don't stream for image analysis
+                stream=True
             )
             
             # Check if response was blocked
             if response.prompt_feedback.block_reason:
                 raise Exception("Response was blocked due to safety settings")
                 
-            # Get the text response
-            text_response = response.text
-            
-            # Find the ImageAnalysisWindow instance and update it
-            for window in QtWidgets.QApplication.topLevelWidgets():
-                if window.__class__.__name__ == 'ImageAnalysisWindow':
-                    window.add_ai_response(text_response)
-                    break
+            # Stream the text response into the window as it arrives
+            self.emit_stream((chunk.text for chunk in response), response_window.token_received)
+            response_window.response_finished.emit()
                     
         except Exception as e:
             logging.error(f"Error in Gemini image analysis: {str(e)}")
-            for window in QtWidgets.QApplication.topLevelWidgets():
-                if window.__class__.__name__ == 'ImageAnalysisWindow':
-                    window.add_ai_response(f"Error analyzing image: {str(e)}")
-                    break
+            response_window.response_ready.emit(f"Error analyzing image: {str(e)}")
 
 class OpenAICompatibleProvider(AIProvider):
     def __init__(self, app):
@@ -287,13 +320,7 @@ class OpenAICompatibleProvider(AIProvider):
 
         if streaming:
             try:
-                for chunk in response:
-                    if self.close_requested:
-                        break
-                    else:
-                        # Strip any trailing newlines from chunks
-                        if chunk.choices[0].delta.content:
-                            self.app.output_ready_signal.emit(chunk.choices[0].delta.content.rstrip('\n'))
+                self.emit_stream(chunk.choices[0].delta.content for chunk in response if chunk.choices[0].delta.content)
 
             except Exception as e:
                 logging.error(f"Error while streaming: {e}")
@@ -310,6 +337,9 @@ class OpenAICompatibleProvider(AIProvider):
             self.app.replace_text(True)
 
     def after_load(self):
+        # Imported here so httpx and the OpenAI SDK are only loaded when this provider is used
+        from openai import OpenAI
+
         self.client = OpenAI(api_key=self.api_key, base_url=self.api_base, organization=self.api_organisation, project=self.api_project)
 
     def before_load(self):
@@ -318,16 +348,21 @@ class OpenAICompatibleProvider(AIProvider):
     def cancel(self):
         self.close_requested = True
 
-    def analyze_image(self, screenshot_path, prompt):
+    def analyze_image(self, screenshot_path, prompt, response_window):
         """
         Analyze an image using OpenAI's vision capabilities
         """
+        self.close_requested = False
         try:
             import base64
             
-            # Read and encode the image
+            # Read and encode the image in 57 KiB chunks (a multiple of 3 bytes keeps the
+            # base64 output of each chunk aligned) so the raw file is never held whole
+            encoded_image = bytearray()
             with open(screenshot_path, "rb") as image_file:
-                encoded_image = base64.b64encode(image_file.read()).decode('utf-8')
+                while chunk := image_file.read(57 * 1024):
+                    encoded_image += base64.b64encode(chunk)
+            encoded_image = encoded_image.decode('ascii')
             
             # Create the API request
             response = self.client.chat.completions.create(
@@ -340,27 +375,25 @@ class OpenAICompatibleProvider(AIProvider):
                             {
                                 "type": "image_url",
                                 "image_url": {
-                                    "url": f"data:image/jpeg;base64,{encoded_image}"
+                                    "url": f"data:image/png;base64,{encoded_image}"
                                 }
                             }
                         ]
                     }
                 ],
-                max_tokens=500
+                max_tokens=500,
+                stream=True
             )
             
-            # Get the response text
-            text_response = response.choices[0].message.content
-            
-            # Find the ImageAnalysisWindow instance and update it
-            for window in QtWidgets.QApplication.topLevelWidgets():
-                if window.__class__.__name__ == 'ImageAnalysisWindow':
-                    window.add_ai_response(text_response)
-                    break
+            # Stream the response text into the window as it arrives
+            try:
+                self.emit_stream((chunk.choices[0].delta.content for chunk in response
+                                  if chunk.choices and chunk.choices[0].delta.content),
+                                 response_window.token_received)
+            finally:
+                response.close()
+            response_window.response_finished.emit()
                     
         except Exception as e:
             logging.error(f"Error in OpenAI image analysis: {str(e)}")
-            for window in QtWidgets.QApplication.topLevelWidgets():
-                if window.__class__.__name__ == 'ImageAnalysisWindow':
-                    window.add_ai_response(f"Error analyzing image: {str(e)}")
-                    break
+            response_window.response_ready.emit(f"Error analyzing image: {str(e)}")
@@ -1,28 +1,202 @@
 from PySide6 import QtWidgets, QtCore, QtGui
 from PySide6.QtCore import Qt
+import functools
+import html
+import logging
 import os
 import re
+import threading
 from .UIUtils import ThemeBackground, colorMode
-from pygments import highlight
-from pygments.formatters import HtmlFormatter
-from pygments.lexers import get_lexer_by_name, guess_lexer
-from pygments.util import ClassNotFound
+
+# Matches ```language\ncode``` blocks
+CODE_BLOCK_PATTERN = re.compile(r'```(\w+)?\n(.*?)```', re.DOTALL)
+
+# Pygments is imported on first use below: it pulls in a lot of modules, and many
+# sessions never open an image analysis window or get a code block back.
+
+# Lexers by language name, shared across windows; None marks a name Pygments doesn't know
+_lexer_cache = {}
+
+def get_cached_lexer(lang):
+    """
+    Return the Pygments lexer for a language name, building it only the first time.
+    Raises ClassNotFound for unknown languages.
+    """
+    from pygments.util import ClassNotFound
+
+    if lang not in _lexer_cache:
+        from pygments.lexers import get_lexer_by_name
+
+        try:
+            _lexer_cache[lang] = get_lexer_by_name(lang)
+        except ClassNotFound:
+            _lexer_cache[lang] = None
+    lexer = _lexer_cache[lang]
+    if lexer is None:
+        raise ClassNotFound(f'no lexer for alias {lang!r} found')
+    return lexer
+
+@functools.lru_cache(maxsize=None)
+def get_formatter():
+    """
+    Build the syntax highlighting formatter with custom styles on first use.
+    colorMode is fixed, so one formatter serves every window.
+    """
+    from pygments.formatters import HtmlFormatter
+
+    # Emit short class names; the colors come from get_code_style_sheet, so each token
+    # doesn't carry its own inline style through Qt's HTML parser.
+    # nowrap: highlight_code_block adds the prebuilt HIGHLIGHTED_CODE_BLOCK_OPEN wrapper itself.
+    return HtmlFormatter(
+        style='monokai' if colorMode == 'dark' else 'default',
+        cssclass='highlight',
+        noclasses=False,
+        linenos=False,
+        nowrap=True
+    )
+
+@functools.lru_cache(maxsize=None)
+def get_code_style_sheet():
+    """Return the CSS rules for the formatter's token classes"""
+    return get_formatter().get_style_defs('.highlight')
+
+# Theme colors, resolved once against the import-time colorMode
+DARK_PALETTE = {
+    'window_bg': '#1e1e1e', 'panel_bg': '#222', 'panel_border': '#444', 'text': '#fff',
+    'selection': '#444', 'input_area_bg': '#333', 'input_bg': '#444', 'input_border': '#555',
+    'input_focus': '#666', 'code_bg': '#444',
+    'button_bg': '#2e7d32', 'button_hover': '#1b5e20', 'button_pressed': '#194d19',
+}
+LIGHT_PALETTE = {
+    'window_bg': '#f0f0f0', 'panel_bg': '#fff', 'panel_border': '#ddd', 'text': '#000',
+    'selection': '#cce8ff', 'input_area_bg': '#f5f5f5', 'input_bg': '#fff', 'input_border': '#ddd',
+    'input_focus': '#999', 'code_bg': '#f5f5f5',
+    'button_bg': '#4CAF50', 'button_hover': '#45a049', 'button_pressed': '#3d8b40',
+}
+colors = DARK_PALETTE if colorMode == 'dark' else LIGHT_PALETTE
+
+# Opening tag for code blocks Pygments has no lexer for
+PLAIN_CODE_BLOCK_OPEN = f'<pre style="background-color: {colors["code_bg"]}; padding: 10px; border-radius: 5px;">'
+
+# Escapes reply text outside code blocks in one pass; newlines become line breaks
+# so the formatted reply keeps the layout it had while streaming in
+PROSE_ESCAPE_TABLE = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;', '\n': '<br>'})
+
+# Wrapper for Pygments output; the class matches the selectors from get_code_style_sheet
+HIGHLIGHTED_CODE_BLOCK_OPEN = '<div class="highlight"><pre style="border-radius: 5px; padding: 15px; margin: 10px 0;">'
+
+# Window stylesheet, keyed by objectName; built once since colorMode is fixed at import
+WINDOW_STYLESHEET = f"""
+    QMainWindow {{
+        background-color: {colors['window_bg']};
+    }}
+    QFrame#imageFrame, QFrame#chatFrame {{
+        background-color: {colors['panel_bg']};
+        border: 1px solid {colors['panel_border']};
+        border-radius: 8px;
+        padding: 10px;
+    }}
+    QTextEdit#chatHistory {{
+        background-color: transparent;
+        color: {colors['text']};
+        border: none;
+        font-family: "Segoe UI", "Arial", sans-serif;
+        font-size: 14px;
+        selection-background-color: {colors['selection']};
+    }}
+    QFrame#inputFrame {{
+        background-color: {colors['input_area_bg']};
+        border-radius: 8px;
+        padding: 10px;
+    }}
+    QLineEdit#chatInput {{
+        background-color: {colors['input_bg']};
+        color: {colors['text']};
+        border: 1px solid {colors['input_border']};
+        border-radius: 5px;
+        padding: 8px 12px;
+        font-size: 14px;
+    }}
+    QLineEdit#chatInput:focus {{
+        border: 1px solid {colors['input_focus']};
+    }}
+    QPushButton#sendButton {{
+        background-color: {colors['button_bg']};
+        color: white;
+        border: none;
+        border-radius: 5px;
+        padding: 8px 20px;
+        font-size: 14px;
+        font-weight: bold;
+    }}
+    QPushButton#sendButton:hover {{
+        background-color: {colors['button_hover']};
+    }}
+    QPushButton#sendButton:pressed {{
+        background-color: {colors['button_pressed']};
+    }}
+"""
+
+def plain_code_block(code):
+    """Return a code block as escaped, unhighlighted HTML"""
+    # Escaped so '<' and '&' in the code show up literally instead of as markup
+    return f'{PLAIN_CODE_BLOCK_OPEN}{html.escape(code, quote=False)}</pre>'
+
+@functools.lru_cache(maxsize=128)
+def highlight_code_block(code, lang):
+    """
+    Return the highlighted HTML for a code block, memoized so repeated snippets
+    (common in follow-up answers) skip tokenizing and formatting.
+    """
+    from pygments import highlight
+
+    highlighted = highlight(code, get_cached_lexer(lang), get_formatter())
+    return f'{HIGHLIGHTED_CODE_BLOCK_OPEN}{highlighted}</pre></div>'
+
+def replace_code_block(match):
+    """Return the HTML for one CODE_BLOCK_PATTERN match"""
+    from pygments.util import ClassNotFound
+
+    code = match.group(2)
+    lang = match.group(1) if match.group(1) else ''
+
+    # A short one-liner gains little from colors, so don't send it through Pygments
+    if len(code) < 40 and '\n' not in code.rstrip('\n'):
+        return plain_code_block(code)
+
+    try:
+        # Unlabelled blocks are rendered as plain text; guess_lexer runs every
+        # registered lexer's analyser over the snippet and is far too slow here
+        return highlight_code_block(code, lang or 'text')
+    except ClassNotFound:
+        # If the language is unknown, default to plain text
+        return plain_code_block(code)
 
 class ImageAnalysisWindow(QtWidgets.QMainWindow):
+    # Emitted from the analysis thread; queued onto the GUI thread
+    response_ready = QtCore.Signal(str)
+    token_received = QtCore.Signal(str)
+    response_finished = QtCore.Signal()
+    # Emitted from the image loading thread with the cache key and scaled image
+    image_ready = QtCore.Signal(str, QtGui.QImage)
+
     def __init__(self, app, screenshot_path):
         super().__init__()
         self.app = app
         self.screenshot_path = screenshot_path
-        
-        # Initialize syntax highlighting formatter with custom styles
-        style = 'monokai' if colorMode == 'dark' else 'default'
-        self.formatter = HtmlFormatter(
-            style=style,
-            cssclass='highlight',
-            noclasses=True,
-            linenos=False,
-            prestyles='border-radius: 5px; padding: 15px; margin: 10px 0;'
-        )
+        # Cursor selecting the pending "AI is analyzing..." placeholder, if any
+        self._thinking_cursor = None
+        # Start of the AI response currently being streamed in, and its text so far
+        self._response_cursor = None
+        self._response_chunks = []
+        self.response_ready.connect(self.add_ai_response)
+        self.token_received.connect(self.append_ai_token)
+        self.response_finished.connect(self.finish_ai_response)
+        self.image_ready.connect(self.set_scaled_image)
+        self.dragging = False
+        self.resizing = False
+        self._width, self._height = self.width(), self.height()
+        self._cursor_shape = Qt.ArrowCursor
         
         self.init_ui()
 
@@ -49,137 +223,125 @@ class ImageAnalysisWindow(QtWidgets.QMainWindow):
 
         # Left side - Image display
         image_frame = QtWidgets.QFrame()
-        image_frame.setStyleSheet(f"""
-            QFrame {{
-                background-color: {'#222' if colorMode == 'dark' else '#fff'};
-                border: 1px solid {'#444' if colorMode == 'dark' else '#ddd'};
-                border-radius: 8px;
-                padding: 10px;
-            }}
-        """)
+        image_frame.setObjectName("imageFrame")
         image_layout = QtWidgets.QVBoxLayout(image_frame)
         
         # Load and display the image
-        pixmap = QtGui.QPixmap(self.screenshot_path)
-        scaled_pixmap = pixmap.scaled(450, 450, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-        
         self.image_label = QtWidgets.QLabel()
-        self.image_label.setPixmap(scaled_pixmap)
         self.image_label.setAlignment(Qt.AlignCenter)
+        self.load_image(450)
         image_layout.addWidget(self.image_label)
         
         content_layout.addWidget(image_frame)
         
         # Right side - Chat interface
         chat_frame = QtWidgets.QFrame()
-        chat_frame.setStyleSheet(f"""
-            QFrame {{
-                background-color: {'#222' if colorMode == 'dark' else '#fff'};
-                border: 1px solid {'#444' if colorMode == 'dark' else '#ddd'};
-                border-radius: 8px;
-                padding: 10px;
-            }}
-        """)
+        chat_frame.setObjectName("chatFrame")
         chat_layout = QtWidgets.QVBoxLayout(chat_frame)
         
         # Chat history
         self.chat_history = QtWidgets.QTextEdit()
         self.chat_history.setReadOnly(True)
-        self.chat_history.setStyleSheet(f"""
-            QTextEdit {{
-                background-color: transparent;
-                color: {'#fff' if colorMode == 'dark' else '#000'};
-                border: none;
-                font-family: "Segoe UI", "Arial", sans-serif;
-                font-size: 14px;
-                selection-background-color: {'#444' if colorMode == 'dark' else '#cce8ff'};
-            }}
-        """)
+        # Bound the transcript so layout cost can't grow without limit in long sessions
+        self.chat_history.document().setMaximumBlockCount(1000)
+        self.chat_history.setObjectName("chatHistory")
         chat_layout.addWidget(self.chat_history)
         
         # Input area
         input_frame = QtWidgets.QFrame()
-        input_frame.setStyleSheet(f"""
-            QFrame {{
-                background-color: {'#333' if colorMode == 'dark' else '#f5f5f5'};
-                border-radius: 8px;
-                padding: 10px;
-            }}
-        """)
+        input_frame.setObjectName("inputFrame")
         input_layout = QtWidgets.QHBoxLayout(input_frame)
         
         self.input_field = QtWidgets.QLineEdit()
         self.input_field.setPlaceholderText("Ask about the image...")
-        self.input_field.setStyleSheet(f"""
-            QLineEdit {{
-                background-color: {'#444' if colorMode == 'dark' else '#fff'};
-                color: {'#fff' if colorMode == 'dark' else '#000'};
-                border: 1px solid {'#555' if colorMode == 'dark' else '#ddd'};
-                border-radius: 5px;
-                padding: 8px 12px;
-                font-size: 14px;
-            }}
-            QLineEdit:focus {{
-                border: 1px solid {'#666' if colorMode == 'dark' else '#999'};
-            }}
-        """)
+        self.input_field.setObjectName("chatInput")
         self.input_field.returnPressed.connect(self.send_message)
         input_layout.addWidget(self.input_field)
         
-        send_button = QtWidgets.QPushButton("Send")
-        send_button.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {'#2e7d32' if colorMode == 'dark' else '#4CAF50'};
-                color: white;
-                border: none;
-                border-radius: 5px;
-                padding: 8px 20px;
-                font-size: 14px;
-                font-weight: bold;
-            }}
-            QPushButton:hover {{
-                background-color: {'#1b5e20' if colorMode == 'dark' else '#45a049'};
-            }}
-            QPushButton:pressed {{
-                background-color: {'#194d19' if colorMode == 'dark' else '#3d8b40'};
-            }}
-        """)
-        send_button.clicked.connect(self.send_message)
-        input_layout.addWidget(send_button)
+        self.send_button = QtWidgets.QPushButton("Send")
+        self.send_button.setObjectName("sendButton")
+        self.send_button.clicked.connect(self.send_message)
+        input_layout.addWidget(self.send_button)
         
         chat_layout.addWidget(input_frame)
         content_layout.addWidget(chat_frame, stretch=1)
 
         main_layout.addWidget(content_container)
 
-        # Set window background color
-        self.setStyleSheet(f"""
-            QMainWindow {{
-                background-color: {'#1e1e1e' if colorMode == 'dark' else '#f0f0f0'};
-            }}
-        """)
+        # Style the whole window with one stylesheet, parsed once here rather than per child widget
+        self.setStyleSheet(WINDOW_STYLESHEET)
+
+    def load_image(self, size):
+        """
+        Show the screenshot scaled to fit size x size, reusing a cached copy across window opens.
+        On a cache miss the image is decoded straight to the target size on a worker thread.
+        """
+        try:
+            mtime = os.path.getmtime(self.screenshot_path)
+        except OSError:
+            mtime = 0
+        key = f"{self.screenshot_path}:{mtime}:{size}x{size}"
+
+        pixmap = QtGui.QPixmapCache.find(key)
+        if pixmap is not None and not pixmap.isNull():
+            self.image_label.setPixmap(pixmap)
+            return
+
+        # Only the header is read here; reserve the final size so the layout doesn't jump
+        target = QtGui.QImageReader(self.screenshot_path).size().scaled(size, size, Qt.KeepAspectRatio)
+        self.image_label.setMinimumSize(target)
+        threading.Thread(target=self.load_image_thread, args=(target, key), daemon=True).start()
+
+    def load_image_thread(self, target, key):
+        """
+        Thread function to decode the screenshot at the target size and hand it to the GUI thread.
+        """
+        # QImageReader scales while reading (smoothly, for formats that can't decode scaled),
+        # so the full-resolution image never reaches Python. QImage is safe off the GUI thread.
+        reader = QtGui.QImageReader(self.screenshot_path)
+        reader.setScaledSize(target)
+        image = reader.read()
+        if image.isNull():
+            logging.error(f"Error loading screenshot: {reader.errorString()}")
+            return
+        # Convert here, off the GUI thread, to the format Qt renders fastest
+        self.image_ready.emit(key, image.convertToFormat(QtGui.QImage.Format_ARGB32_Premultiplied))
+
+    def set_scaled_image(self, key, image):
+        pixmap = QtGui.QPixmap.fromImage(image)
+        QtGui.QPixmapCache.insert(key, pixmap)
+        self.image_label.setPixmap(pixmap)
 
     def format_code_blocks(self, text):
-        """Format code blocks with syntax highlighting"""
-        def replace_code_block(match):
-            code = match.group(2)
-            lang = match.group(1) if match.group(1) else ''
-            
-            try:
-                if lang:
-                    lexer = get_lexer_by_name(lang)
-                else:
-                    lexer = guess_lexer(code)
-                return highlight(code, lexer, self.formatter)
-            except ClassNotFound:
-                # If language detection fails, default to plain text
-                return f'<pre style="background-color: {"#444" if colorMode == "dark" else "#f5f5f5"}; padding: 10px; border-radius: 5px;">{code}</pre>'
-        
-        # Replace ```language\ncode``` blocks
-        pattern = r'```(\w+)?\n(.*?)```'
-        text = re.sub(pattern, replace_code_block, text, flags=re.DOTALL)
-        
-        return text
+        """Convert a reply to HTML: text is escaped and code blocks are syntax highlighted"""
+        # Plain-text replies (the common case) don't need the regex pass at all
+        if '```' not in text:
+            return text.translate(PROSE_ESCAPE_TABLE)
+
+        # Applies to HTML inserted from now on, so set it before the first code block goes in
+        document = self.chat_history.document()
+        if not document.defaultStyleSheet():
+            document.setDefaultStyleSheet(get_code_style_sheet())
+
+        # Replace ```language\ncode``` blocks, escaping the text between them
+        parts = []
+        end = 0
+        for match in CODE_BLOCK_PATTERN.finditer(text):
+            # Code blocks are block-level already, so drop the newlines right around the fences
+            prose = text[end:match.start()]
+            if end and prose.startswith('\n'):
+                prose = prose[1:]
+            if prose.endswith('\n'):
+                prose = prose[:-1]
+            parts.append(prose.translate(PROSE_ESCAPE_TABLE))
+            parts.append(replace_code_block(match))
+            end = match.end()
+        tail = text[end:]
+        if tail.startswith('\n'):
+            tail = tail[1:]
+        parts.append(tail.translate(PROSE_ESCAPE_TABLE))
+
+        return ''.join(parts)
 
     def send_message(self, default_prompt=None):
         """Send a message to the AI for analysis"""
@@ -187,38 +349,159 @@ class ImageAnalysisWindow(QtWidgets.QMainWindow):
         if not question:
             return
             
-        # Add user question to chat history
-        self.chat_history.append(f'<b>You:</b> {question}<br>')
-        
         # Clear input field
         self.input_field.clear()
+        # One question at a time: the reply streams into the end of the transcript
+        self.set_input_enabled(False)
+
+        # Add the user question and the "AI is thinking..." message as one edit with one repaint
+        document = self.chat_history.document()
+        self.chat_history.setUpdatesEnabled(False)
+        try:
+            cursor = QtGui.QTextCursor(document)
+            cursor.movePosition(QtGui.QTextCursor.End)
+            cursor.beginEditBlock()
+            if not document.isEmpty():
+                cursor.insertBlock(QtGui.QTextBlockFormat(), QtGui.QTextCharFormat())
+            cursor.insertHtml('<b>You:</b> ')
+            # Insert the question as plain text: it is never parsed as HTML, however long or odd it is
+            cursor.insertText(question, QtGui.QTextCharFormat())
+            cursor.insertBlock(QtGui.QTextBlockFormat(), QtGui.QTextCharFormat())
+            thinking_start = cursor.position()
+            cursor.insertHtml('<i>AI is analyzing the image...</i><br>')
+            cursor.endEditBlock()
+        finally:
+            self.chat_history.setUpdatesEnabled(True)
+
+        # Remember where the placeholder is so it can be removed in place
+        thinking_cursor = QtGui.QTextCursor(document)
+        thinking_cursor.setPosition(thinking_start)
+        thinking_cursor.movePosition(QtGui.QTextCursor.End, QtGui.QTextCursor.KeepAnchor)
+        # Text appended after the placeholder must not extend the selection
+        thinking_cursor.setKeepPositionOnInsert(True)
+        self._thinking_cursor = thinking_cursor
+
+        # Show the question that was just asked, even if the reader had scrolled up
+        QtCore.QTimer.singleShot(0, self.scroll_to_bottom)
         
-        # Add "AI is thinking..." message
-        self.chat_history.append('<i>AI is analyzing the image...</i><br>')
-        
-        # Send to AI for analysis
+        # Send to AI for analysis in a separate thread so the window stays responsive
+        threading.Thread(target=self.analyze_image_thread, args=(question,), daemon=True).start()
+
+    def analyze_image_thread(self, question):
+        """
+        Thread function to run the provider's image analysis. The provider streams the reply through
+        token_received and response_finished; response_ready only carries errors.
+        """
         try:
-            self.app.current_provider.analyze_image(self.screenshot_path, question)
+            self.app.current_provider.analyze_image(self.screenshot_path, question, self)
         except Exception as e:
-            self.add_ai_response(f"Error analyzing image: {str(e)}")
+            logging.error(f"Error analyzing image: {e}")
+            self.response_ready.emit(f"Error analyzing image: {str(e)}")
         
+    def remove_thinking_message(self):
+        """Remove the "AI is thinking..." message without re-serializing the whole document"""
+        if self._thinking_cursor is not None:
+            thinking_cursor = self._thinking_cursor
+            self._thinking_cursor = None
+            thinking_cursor.removeSelectedText()
+            thinking_cursor.deletePreviousChar()  # Drop the now-empty paragraph
+
     def add_ai_response(self, response):
         """Add AI response to chat history with syntax highlighting"""
-        # Remove the "AI is thinking..." message
-        current_text = self.chat_history.toHtml()
-        current_text = current_text.replace('<i>AI is analyzing the image...</i><br>', '')
-        self.chat_history.setHtml(current_text)
-        
+        # Close off any response that was being streamed in before this one
+        if self._response_cursor is not None:
+            self.finish_ai_response()
+
         # Format the response with syntax highlighting for code blocks
         formatted_response = self.format_code_blocks(response)
-        
-        # Add the AI response
-        self.chat_history.append(f'<b>AI:</b> {formatted_response}<br>')
-        
-        # Scroll to bottom
-        self.chat_history.verticalScrollBar().setValue(
-            self.chat_history.verticalScrollBar().maximum()
-        )
+        follow = self.is_scrolled_to_bottom()
+
+        # Batch the placeholder removal and insertion into a single repaint
+        self.chat_history.setUpdatesEnabled(False)
+        try:
+            self.remove_thinking_message()
+
+            # Add the AI response
+            self.chat_history.append(f'<b>AI:</b> {formatted_response}<br>')
+        finally:
+            self.chat_history.setUpdatesEnabled(True)
+
+        # Scroll to bottom once Qt has finished laying out the new block
+        if follow:
+            QtCore.QTimer.singleShot(0, self.scroll_to_bottom)
+        self.set_input_enabled(True)
+
+    def append_ai_token(self, text):
+        """
+        Show a streamed piece of the AI response as plain text. Highlighting waits for
+        finish_ai_response, so Pygments never runs on half-written code blocks.
+        """
+        document = self.chat_history.document()
+        cursor = QtGui.QTextCursor(document)
+        cursor.movePosition(QtGui.QTextCursor.End)
+        follow = self.is_scrolled_to_bottom()
+
+        if self._response_cursor is None:
+            self.remove_thinking_message()
+            cursor.movePosition(QtGui.QTextCursor.End)
+            if not document.isEmpty():
+                cursor.insertBlock(QtGui.QTextBlockFormat(), QtGui.QTextCharFormat())
+            cursor.insertHtml('<b>AI:</b> ')
+            self._response_cursor = QtGui.QTextCursor(document)
+            self._response_cursor.setPosition(cursor.position())
+            # Streamed text lands at this position; the cursor must stay at its start
+            self._response_cursor.setKeepPositionOnInsert(True)
+
+        self._response_chunks.append(text)
+        cursor.insertText(text, QtGui.QTextCharFormat())
+        if follow:
+            QtCore.QTimer.singleShot(0, self.scroll_to_bottom)
+
+    def finish_ai_response(self):
+        """Replace the streamed plain text with the fully formatted response"""
+        if self._response_cursor is None:
+            # Nothing was streamed (an empty reply), still show that the AI answered
+            self.add_ai_response('')
+            return
+
+        cursor = self._response_cursor
+        response = ''.join(self._response_chunks)
+        self._response_cursor = None
+        self._response_chunks = []
+        follow = self.is_scrolled_to_bottom()
+
+        self.chat_history.setUpdatesEnabled(False)
+        try:
+            # keepPositionOnInsert only pins the position; the anchor moved on with every
+            # streamed token, so collapse onto the response start before selecting to the end
+            cursor.clearSelection()
+            cursor.movePosition(QtGui.QTextCursor.End, QtGui.QTextCursor.KeepAnchor)
+            cursor.insertHtml(f'{self.format_code_blocks(response)}<br>')
+        finally:
+            self.chat_history.setUpdatesEnabled(True)
+
+        if follow:
+            QtCore.QTimer.singleShot(0, self.scroll_to_bottom)
+        self.set_input_enabled(True)
+
+    def set_input_enabled(self, enabled):
+        """Allow or block asking the next question"""
+        self.input_field.setEnabled(enabled)
+        self.send_button.setEnabled(enabled)
+        if enabled:
+            self.input_field.setFocus()
+
+    def is_scrolled_to_bottom(self):
+        """
+        Whether the chat is scrolled all the way down. Checked before inserting a reply, so
+        a reader who scrolled up isn't pulled back down and no extra scroll is queued.
+        """
+        scroll_bar = self.chat_history.verticalScrollBar()
+        return scroll_bar.value() >= scroll_bar.maximum()
+
+    def scroll_to_bottom(self):
+        scroll_bar = self.chat_history.verticalScrollBar()
+        scroll_bar.setValue(scroll_bar.maximum())
 
     def keyPressEvent(self, event):
         """Handle key press events"""
@@ -236,20 +519,11 @@ class ImageAnalysisWindow(QtWidgets.QMainWindow):
     def mousePressEvent(self, event):
         if event.button() == Qt.LeftButton:
             # Check if click is in resize area (window edges)
-            edge_size = 8
-            pos = event.position()
-            x, y = pos.x(), pos.y()
-            width, height = self.width(), self.height()
-            
-            # Determine which edge was clicked
-            left_edge = x <= edge_size
-            right_edge = width - edge_size <= x <= width
-            top_edge = y <= edge_size
-            bottom_edge = height - edge_size <= y <= height
+            edges = self.edges_at(event.position())
             
-            if any([left_edge, right_edge, top_edge, bottom_edge]):
+            if any(edges):
                 self.resizing = True
-                self.resize_edge = (left_edge, right_edge, top_edge, bottom_edge)
+                self.resize_edge = edges
                 self.resize_start_geometry = self.geometry()
                 self.resize_cursor_start = event.globalPosition()
                 event.accept()
@@ -262,7 +536,7 @@ class ImageAnalysisWindow(QtWidgets.QMainWindow):
     def mouseReleaseEvent(self, event):
         self.dragging = False
         self.resizing = False
-        self.setCursor(Qt.ArrowCursor)
+        self.set_cursor_shape(Qt.ArrowCursor)
 
     def mouseMoveEvent(self, event):
         if self.resizing and event.buttons() == Qt.LeftButton:
@@ -292,23 +566,39 @@ class ImageAnalysisWindow(QtWidgets.QMainWindow):
             # Update cursor based on mouse position
             self.update_cursor(event.position())
 
-    def update_cursor(self, pos):
-        edge_size = 8
+    def resizeEvent(self, event):
+        # Cache the size for the edge checks that run on every mouse move
+        self._width, self._height = self.width(), self.height()
+        super().resizeEvent(event)
+
+    def edges_at(self, pos, edge_size=8):
+        """Return which window edges (left, right, top, bottom) the position is within edge_size of"""
         x, y = pos.x(), pos.y()
-        width, height = self.width(), self.height()
-        
-        left_edge = x <= edge_size
-        right_edge = width - edge_size <= x <= width
-        top_edge = y <= edge_size
-        bottom_edge = height - edge_size <= y <= height
+        width, height = self._width, self._height
+        return (
+            x <= edge_size,
+            width - edge_size <= x <= width,
+            y <= edge_size,
+            height - edge_size <= y <= height,
+        )
+
+    def update_cursor(self, pos):
+        left_edge, right_edge, top_edge, bottom_edge = self.edges_at(pos)
         
         if (top_edge and left_edge) or (bottom_edge and right_edge):
-            self.setCursor(Qt.SizeFDiagCursor)
+            shape = Qt.SizeFDiagCursor
         elif (top_edge and right_edge) or (bottom_edge and left_edge):
-            self.setCursor(Qt.SizeBDiagCursor)
+            shape = Qt.SizeBDiagCursor
         elif left_edge or right_edge:
-            self.setCursor(Qt.SizeHorCursor)
+            shape = Qt.SizeHorCursor
         elif top_edge or bottom_edge:
-            self.setCursor(Qt.SizeVerCursor)
+            shape = Qt.SizeVerCursor
         else:
-            self.setCursor(Qt.ArrowCursor)
+            shape = Qt.ArrowCursor
+        self.set_cursor_shape(shape)
+
+    def set_cursor_shape(self, shape):
+        # setCursor reaches into the windowing system, so only call it when the shape changes
+        if shape != self._cursor_shape:
+            self._cursor_shape = shape
+            self.setCursor(shape)
@@ -26,7 +26,7 @@ class UIUtils:
         image = image.scaledToWidth(image_size)
         clipPath = QtGui.QPainterPath()
         clipPath.addRoundedRect(0, 0, image_size, image_size, rounding_amount, rounding_amount)
-        target = QImage(image_size, image_size, QImage.Format_ARGB32)
+        target = QImage(image_size, image_size, QImage.Format_ARGB32_Premultiplied)
         target.fill(QtCore.Qt.GlobalColor.transparent)
         painter = QtGui.QPainter(target)
         painter.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing)
@@ -56,6 +56,9 @@ class ThemeBackground(QtWidgets.QWidget):
         self.setAttribute(QtCore.Qt.WA_StyledBackground, True)
         self.theme = theme
         self.is_popup = is_popup
+        # Background scaled to this widget, and the (size, device pixel ratio) it was scaled for
+        self._scaled_background = None
+        self._scaled_for = None
 
     def paintEvent(self, event):
         """
@@ -64,10 +67,22 @@ class ThemeBackground(QtWidgets.QWidget):
         painter = QtGui.QPainter(self)
         if self.theme == 'gradient':
             if self.is_popup:
-                background_image = QtGui.QPixmap(os.path.join(os.path.dirname(sys.argv[0]), 'background_popup_dark.png' if colorMode == 'dark' else 'background_popup.png'))
+                image_path = os.path.join(os.path.dirname(sys.argv[0]), 'background_popup_dark.png' if colorMode == 'dark' else 'background_popup.png')
             else:
-                background_image = QtGui.QPixmap(os.path.join(os.path.dirname(sys.argv[0]), 'background_dark.png' if colorMode == 'dark' else 'background.png'))
-            painter.drawPixmap(self.rect(), background_image)
+                image_path = os.path.join(os.path.dirname(sys.argv[0]), 'background_dark.png' if colorMode == 'dark' else 'background.png')
+            # Paint events are frequent; decode the PNG once and share it across all windows
+            background_image = QtGui.QPixmapCache.find(image_path)
+            if background_image is None or background_image.isNull():
+                background_image = QtGui.QPixmap(image_path)
+                QtGui.QPixmapCache.insert(image_path, background_image)
+            # Scale once per widget size rather than on every paint. Kept on the widget, not in
+            # QPixmapCache, so a live resize doesn't evict other cached pixmaps.
+            ratio = self.devicePixelRatioF()
+            if self._scaled_for != (self.size(), ratio):
+                self._scaled_background = background_image.scaled(self.size() * ratio)
+                self._scaled_background.setDevicePixelRatio(ratio)
+                self._scaled_for = (self.size(), ratio)
+            painter.drawPixmap(0, 0, self._scaled_background)
         else:
             if colorMode == 'dark':
                 painter.fillRect(self.rect(), QtGui.QColor(35, 35, 35))  # Dark mode color